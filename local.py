@@ -1,46 +1,42 @@
-if MACOS:
-        sysroot = macosx_sdk_root()
-
     # Check whether the found file is in one of the standard directories
     dirname = os.path.dirname(result)
-    for p in std_dirs:
-        # Ensure path doesn't end with path separator
-        p = p.rstrip(os.sep)
+    # Ensure paths don't end with path separator
+    std_dirs = _stripped_dirs(std_dirs)
+    paths = _stripped_dirs(paths)
 
-        if MACOS and is_macosx_sdk_path(p):
-            # Note that, as of Xcode 7, Apple SDKs may contain textual stub
-            # libraries with .tbd extensions rather than the normal .dylib
-            # shared libraries installed in /.  The Apple compiler tool
-            # chain handles this transparently but it can cause problems
-            # for programs that are being built with an SDK and searching
-            # for specific libraries.  Distutils find_library_file() now
-            # knows to also search for and return .tbd files.  But callers
-            # of find_library_file need to keep in mind that the base filename
-            # of the returned SDK library file might have a different extension
-            # from that of the library file installed on the running system,
-            # for example:
-            #   /Applications/Xcode.app/Contents/Developer/Platforms/
-            #       MacOSX.platform/Developer/SDKs/MacOSX10.11.sdk/
-            #       usr/lib/libedit.tbd
-            # vs
-            #   /usr/lib/libedit.dylib
-            if os.path.join(sysroot, p[1:]) == dirname:
-                return [ ]
+    if not MACOS:
+        if dirname in std_dirs:
+            return [ ]
+        # Otherwise, it must have been in one of the additional directories
+        if dirname in paths:
+            return [dirname]
+        raise RuntimeError(
+            "Internal error: Path not found in std_dirs or paths")
 
-        if p == dirname:
+    for p, sdk_p in _effective_dirs(std_dirs):
+        # Note that, as of Xcode 7, Apple SDKs may contain textual stub
+        # libraries with .tbd extensions rather than the normal .dylib
+        # shared libraries installed in /.  The Apple compiler tool
+        # chain handles this transparently but it can cause problems
+        # for programs that are being built with an SDK and searching
+        # for specific libraries.  Distutils find_library_file() now
+        # knows to also search for and return .tbd files.  But callers
+        # of find_library_file need to keep in mind that the base filename
+        # of the returned SDK library file might have a different extension
+        # from that of the library file installed on the running system,
+        # for example:
+        #   /Applications/Xcode.app/Contents/Developer/Platforms/
+        #       MacOSX.platform/Developer/SDKs/MacOSX10.11.sdk/
+        #       usr/lib/libedit.tbd
+        # vs
+        #   /usr/lib/libedit.dylib
+        if sdk_p == dirname or p == dirname:
             return [ ]
 
     # Otherwise, it must have been in one of the additional directories,
     # so we have to figure out which one.
-    for p in paths:
-        # Ensure path doesn't end with path separator
-        p = p.rstrip(os.sep)
-
-        if MACOS and is_macosx_sdk_path(p):
-            if os.path.join(sysroot, p[1:]) == dirname:
-                return [ p ]
-
-        if p == dirname:
+    for p, sdk_p in _effective_dirs(paths):
+        if sdk_p == dirname or p == dirname:
             return [p]
-    else:
-        assert False, "Internal error: Path not found in std_dirs or paths"
+
+    raise RuntimeError("Internal error: Path not found in std_dirs or paths")
@@ -1,6 +1,7 @@
 # Autodetecting setup.py script for building the Python extensions
 
 import argparse
+import functools
 import importlib._bootstrap
 import importlib.machinery
 import importlib.util
@@ -12,22 +13,30 @@ from glob import glob, escape
 import _osx_support
 
 
-try:
-    import subprocess
-    del subprocess
-    SUBPROCESS_BOOTSTRAP = False
-except ImportError:
-    # Bootstrap Python: distutils.spawn uses subprocess to build C extensions,
-    # subprocess requires C extensions built by setup.py like _posixsubprocess.
-    #
-    # Use _bootsubprocess which only uses the os module.
-    #
-    # It is dropped from sys.modules as soon as all C extension modules
-    # are built.
-    import _bootsubprocess
-    sys.modules['subprocess'] = _bootsubprocess
-    del _bootsubprocess
-    SUBPROCESS_BOOTSTRAP = True
+_subprocess = sys.modules.get('subprocess')
+if _subprocess is not None:
+    # Already loaded, so there is no need to import it just to check.
+    # It may be _bootsubprocess if another module installed it first.
+    SUBPROCESS_BOOTSTRAP = _subprocess.__name__ == '_bootsubprocess'
+else:
+    try:
+        import subprocess
+        del subprocess
+        SUBPROCESS_BOOTSTRAP = False
+    except ImportError:
+        # Bootstrap Python: distutils.spawn uses subprocess to build C
+        # extensions, subprocess requires C extensions built by setup.py
+        # like _posixsubprocess.
+        #
+        # Use _bootsubprocess which only uses the os module.
+        #
+        # It is dropped from sys.modules as soon as all C extension modules
+        # are built.
+        import _bootsubprocess
+        sys.modules['subprocess'] = _bootsubprocess
+        del _bootsubprocess
+        SUBPROCESS_BOOTSTRAP = True
+del _subprocess
 
 
 from distutils import log
@@ -98,6 +107,15 @@ Topic :: Software Development
 
 
 def run_command(cmd):
+    # 'cmd' is a shell command string or an argument list.  Run a list
+    # directly rather than through /bin/sh -c, except under the bootstrap
+    # subprocess module, which only supports what distutils needs.
+    if not isinstance(cmd, str):
+        if not SUBPROCESS_BOOTSTRAP:
+            import subprocess
+            return subprocess.call(cmd)
+        import shlex
+        cmd = shlex.join(cmd)
     status = os.system(cmd)
     return os.waitstatus_to_exitcode(status)
 
@@ -106,9 +124,26 @@ def run_command(cmd):
 # reserved for building the interpreter and the stdlib modules.
 # See bpo-21121 and bpo-35257
 def set_compiler_flags(compiler_flags, compiler_py_flags_nodist):
-    flags = sysconfig.get_config_var(compiler_flags)
-    py_flags_nodist = sysconfig.get_config_var(compiler_py_flags_nodist)
-    sysconfig.get_config_vars()[compiler_flags] = flags + ' ' + py_flags_nodist
+    config_vars = sysconfig.get_config_vars()
+    flags = config_vars[compiler_flags]
+    py_flags_nodist = config_vars[compiler_py_flags_nodist]
+    config_vars[compiler_flags] = flags + ' ' + py_flags_nodist
+
+
+# Results of os.path.isdir() keyed by path: the same candidate directories
+# are probed many times while the search paths are assembled.  Only
+# trailing separators are dropped from the key; normpath() would resolve
+# '..' textually and could disagree with the file system across symlinks.
+# clear_path_caches() flushes it.
+_ISDIR_CACHE = {}
+
+def _cached_isdir(path):
+    key = path.rstrip(os.sep) or path
+    try:
+        return _ISDIR_CACHE[key]
+    except KeyError:
+        isdir = _ISDIR_CACHE[key] = os.path.isdir(path)
+        return isdir
 
 
 def add_dir_to_list(dirlist, dir):
@@ -117,7 +152,7 @@ def add_dir_to_list(dirlist, dir):
     1) 'dir' is not already in 'dirlist'
     2) 'dir' actually exists, and is a directory.
     """
-    if dir is None or not os.path.isdir(dir) or dir in dirlist:
+    if dir is None or not _cached_isdir(dir) or dir in dirlist:
         return
     for i, path in enumerate(dirlist):
         if not os.path.isabs(path):
@@ -126,6 +161,10 @@ def add_dir_to_list(dirlist, dir):
     dirlist.insert(0, dir)
 
 
+_SYSROOT_RE = re.compile(r'--sysroot=([^"]\S*|"[^"]+")')
+_ISYSROOT_RE = re.compile(r'-isysroot\s*(\S+)')
+
+
 def sysroot_paths(make_vars, subdirs):
     """Get the paths of sysroot sub-directories.
     * make_vars: a sequence of names of variables of the Makefile where
@@ -134,11 +173,12 @@ def sysroot_paths(make_vars, subdirs):
       headers or libraries.
     """
 
+    config_vars = sysconfig.get_config_vars()
     dirs = []
     for var_name in make_vars:
-        var = sysconfig.get_config_var(var_name)
+        var = config_vars.get(var_name)
         if var is not None:
-            m = re.search(r'--sysroot=([^"]\S*|"[^"]+")', var)
+            m = _SYSROOT_RE.search(var)
             if m is not None:
                 sysroot = m.group(1).strip('"')
                 for subdir in subdirs:
@@ -151,8 +191,12 @@ def sysroot_paths(make_vars, subdirs):
     return dirs
 
 
-MACOS_SDK_ROOT = None
-MACOS_SDK_SPECIFIED = None
+# Sentinel marking the SDK globals as not computed yet; None and False are
+# valid cached values.
+_UNSET = object()
+
+MACOS_SDK_ROOT = _UNSET
+MACOS_SDK_SPECIFIED = _UNSET
 
 def macosx_sdk_root():
     """Return the directory of the current macOS SDK.
@@ -168,17 +212,18 @@ def macosx_sdk_root():
     global MACOS_SDK_ROOT, MACOS_SDK_SPECIFIED
 
     # If already called, return cached result.
-    if MACOS_SDK_ROOT:
+    if MACOS_SDK_ROOT is not _UNSET:
         return MACOS_SDK_ROOT
 
-    cflags = sysconfig.get_config_var('CFLAGS')
-    m = re.search(r'-isysroot\s*(\S+)', cflags)
+    config_vars = sysconfig.get_config_vars()
+    cflags = config_vars.get('CFLAGS')
+    m = _ISYSROOT_RE.search(cflags)
     if m is not None:
         MACOS_SDK_ROOT = m.group(1)
         MACOS_SDK_SPECIFIED = MACOS_SDK_ROOT != '/'
     else:
         MACOS_SDK_ROOT = _osx_support._default_sysroot(
-            sysconfig.get_config_var('CC'))
+            config_vars.get('CC'))
         MACOS_SDK_SPECIFIED = False
 
     return MACOS_SDK_ROOT
@@ -197,11 +242,23 @@ def macosx_sdk_specified():
     global MACOS_SDK_SPECIFIED
 
     # If already called, return cached result.
-    if MACOS_SDK_SPECIFIED:
+    if MACOS_SDK_SPECIFIED is not _UNSET:
         return MACOS_SDK_SPECIFIED
 
     # Find the sdk root and set MACOS_SDK_SPECIFIED
     macosx_sdk_root()
     return MACOS_SDK_SPECIFIED
 
+
+# Directories whose contents are shipped in a macOS SDK, except /usr/local.
+_SDK_PREFIXES = ('/usr/', '/System/Library', '/System/iOSSupport')
+
+@functools.lru_cache(maxsize=256)
+def is_macosx_sdk_path(path):
+    """
+    Returns True if 'path' can be located in a macOS SDK
+    """
+    return (path.startswith(_SDK_PREFIXES)
+            and not path.startswith('/usr/local'))
+
 this message is added from local machine to the file which is created on browser
\ No newline at end of file
@@ -2,6 +2,96 @@
     i am doing an update here..
 """
 
+# Listings of the directories find_file() searches, keyed by directory
+# path.  The first probe of a directory is a plain stat(); only a directory
+# probed again is listed, so the many misses against the same search
+# directories cost one listdir() rather than one stat() each, while large
+# directories probed once are never listed.  _PROBED_ONCE marks a
+# directory seen once, None one that couldn't be listed.
+_DIR_ENTRIES = {}
+_NOT_PROBED = object()
+_PROBED_ONCE = object()
+
+def _listdir(dir):
+    """Return the cached listing of 'dir', or None if 'dir' should be
+    probed with os.path.exists() instead.
+    """
+    entries = _DIR_ENTRIES.get(dir, _NOT_PROBED)
+    if entries is _NOT_PROBED:
+        _DIR_ENTRIES[dir] = _PROBED_ONCE
+        return None
+    if entries is _PROBED_ONCE:
+        try:
+            entries = frozenset(os.listdir(dir))
+        except OSError:
+            entries = None
+        _DIR_ENTRIES[dir] = entries
+    return entries
+
+
+def _existing_file(dir, name):
+    """Return True if 'name' exists in 'dir'.
+    A name missing from the cached listing of 'dir' is reported absent
+    without a stat() call; on case-insensitive file systems this means
+    'name' must match the case of the directory entry exactly.  Anything
+    else is checked with os.path.exists().
+    """
+    entries = _listdir(dir)
+    if entries is not None and name not in entries:
+        return False
+    return os.path.exists(os.path.join(dir, name))
+
+
+def clear_path_caches():
+    """Forget everything cached about the file system while searching
+    for headers and libraries: the directory listings used by
+    find_file() and the os.path.isdir() results used by
+    add_dir_to_list().  Call this after creating or removing files or
+    directories that may be searched.
+    """
+    _DIR_ENTRIES.clear()
+    _ISDIR_CACHE.clear()
+
+
+# Results of _effective_dirs() keyed by the tuple of searched directories:
+# find_file() is called for many files against the same search lists.
+_EFFECTIVE_DIRS = {}
+
+
+# Search lists with trailing path separators removed, keyed by the
+# original directories, so the stripping is done once per search list.
+_STRIPPED_DIRS = {}
+
+def _stripped_dirs(dirs):
+    """Return 'dirs' as a tuple of paths without trailing separators."""
+    key = tuple(dirs)
+    stripped = _STRIPPED_DIRS.get(key)
+    if stripped is None:
+        stripped = tuple(dir.rstrip(os.sep) for dir in key)
+        _STRIPPED_DIRS[key] = stripped
+    return stripped
+
+
+def _effective_dirs(dirs):
+    """Return a sequence of (dir, effective_dir) pairs for 'dirs'.
+    Only used on macOS.  Honor the MacOSX SDK setting: an SDK is a
+    directory with the same structure as a real system, but with only
+    header files and libraries, so directories under an SDK path are
+    looked up inside the SDK root.
+    """
+    # Keyed by the directories themselves rather than by the list
+    # object, which callers may mutate or reuse.
+    key = tuple(dirs)
+    effective = _EFFECTIVE_DIRS.get(key)
+    if effective is None:
+        sysroot = macosx_sdk_root()
+        effective = tuple((dir, os.path.join(sysroot, dir[1:]))
+                          if is_macosx_sdk_path(dir) else (dir, dir)
+                          for dir in key)
+        _EFFECTIVE_DIRS[key] = effective
+    return effective
+
+
 def find_file(filename, std_dirs, paths):
     """Searches for the directory where a given file is located,
     and returns a possibly-empty list of additional directories, or None
@@ -12,29 +102,36 @@ def find_file(filename, std_dirs, paths):
     'paths' is a list of additional locations to check; if the file is
         found in one of them, the resulting list will contain the directory.
     """
+    # 'filename' may name a file in a subdirectory, like openssl/ssl.h
+    subdir, name = os.path.split(filename)
+
     if MACOS:
-        # Honor the MacOSX SDK setting when one was specified.
-        # An SDK is a directory with the same structure as a real
-        # system, but with only header files and libraries.
-        sysroot = macosx_sdk_root()
+        # Same checks as below, but looking inside the SDK where one applies
+        for dir, d in _effective_dirs(std_dirs):
+            if subdir:
+                d = os.path.join(d, subdir)
+
+            if _existing_file(d, name): return []
+
+        for dir, d in _effective_dirs(paths):
+            if subdir:
+                d = os.path.join(d, subdir)
+
+            if _existing_file(d, name):
+                return [dir]
+        return None
 
     # Check the standard locations
     for dir in std_dirs:
-        f = os.path.join(dir, filename)
-
-        if MACOS and is_macosx_sdk_path(dir):
-            f = os.path.join(sysroot, dir[1:], filename)
+        d = os.path.join(dir, subdir) if subdir else dir
 
-        if os.path.exists(f): return []
+        if _existing_file(d, name): return []
 
     # Check the additional directories
     for dir in paths:
-        f = os.path.join(dir, filename)
-
-        if MACOS and is_macosx_sdk_path(dir):
-            f = os.path.join(sysroot, dir[1:], filename)
+        d = os.path.join(dir, subdir) if subdir else dir
 
-        if os.path.exists(f):
+        if _existing_file(d, name):
             return [dir]
 local machine git push on browser
 adding a few line again from local machine